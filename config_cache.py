@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Shared config for Nina job search
+Loads config.json once per process and exposes a flattened view for hot paths
+"""
+import json
+from types import SimpleNamespace
+
+CONFIG_PATH = 'config.json'
+
+# Load config
+with open(CONFIG_PATH, 'r') as f:
+    CONFIG = json.load(f)
+
+def _lowered(terms):
+    """Lowercase a list of config terms into a tuple"""
+    return tuple(term.lower() for term in terms)
+
+# Flattened scoring view - lowercased vocabularies and plain int weights
+CFG = SimpleNamespace(
+    locations=_lowered(CONFIG['search']['locations']),
+    job_titles=_lowered(CONFIG['search']['job_titles']),
+    target_companies=_lowered(CONFIG['search']['target_companies']),
+    industries=_lowered(CONFIG['search']['industries_priority']),
+    exclude_keywords=_lowered(CONFIG['search']['exclude_keywords']),
+    scoring_location=CONFIG['scoring']['location_match'],
+    scoring_title=CONFIG['scoring']['title_match'],
+    scoring_company=CONFIG['scoring']['company_match'],
+    scoring_industry=CONFIG['scoring']['industry_match'],
+    scoring_salary=CONFIG['scoring']['salary_above_min'],
+    scoring_creative=CONFIG['scoring']['creative_industry']
+)
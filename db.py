@@ -4,6 +4,8 @@ Database operations for Nina job search
 """
 import sqlite3
 import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Dict, Optional
 
@@ -12,10 +14,59 @@ DB_PATH = 'nina_jobs.db'
 class JobDatabase:
     def __init__(self, db_path=DB_PATH):
         self.db_path = db_path
+        self._local = threading.local()
     
     def _get_conn(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """
+        Get this thread's database connection
+        Opened once per thread and kept for the lifetime of the object
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA cache_size=-20000')
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+    
+    def close(self):
+        """Close this thread's database connection, if open"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Run a block of writes as a single transaction and yield its cursor
+        Methods called inside the block skip their own commit
+        """
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        
+        if getattr(self._local, 'in_transaction', False):
+            yield cursor
+            return
+        
+        cursor.execute('BEGIN IMMEDIATE')
+        self._local.in_transaction = True
+        try:
+            yield cursor
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        finally:
+            self._local.in_transaction = False
+    
+    def _commit(self, conn):
+        """Commit unless an enclosing transaction() will"""
+        if not getattr(self._local, 'in_transaction', False):
+            conn.commit()
     
     def add_job(self, job: Dict) -> bool:
         """
@@ -26,6 +77,7 @@ class JobDatabase:
         cursor = conn.cursor()
         
         now = datetime.utcnow().isoformat()
+        raw_data = json.dumps(job, separators=(',', ':'))
         
         try:
             cursor.execute('''
@@ -43,10 +95,9 @@ class JobDatabase:
                 job.get('source', ''),
                 now,
                 now,
-                json.dumps(job)
+                raw_data
             ))
-            conn.commit()
-            conn.close()
+            self._commit(conn)
             return True  # New job added
         except sqlite3.IntegrityError:
             # Job already exists, update last_seen
@@ -54,11 +105,50 @@ class JobDatabase:
                 UPDATE jobs 
                 SET last_seen = ?, score = ?, raw_data = ?
                 WHERE url = ?
-            ''', (now, job.get('score', 0), json.dumps(job), job['url']))
-            conn.commit()
-            conn.close()
+            ''', (now, job.get('score', 0), raw_data, job['url']))
+            self._commit(conn)
             return False  # Job already existed
     
+    def add_jobs_batch(self, jobs: List[Dict]) -> int:
+        """
+        Add or refresh a batch of jobs in a single transaction
+        Returns the number of jobs that were new
+        """
+        now = datetime.utcnow().isoformat()
+        rows = [(
+            job['url'],
+            job['title'],
+            job['company'],
+            job.get('location', ''),
+            job.get('salary', ''),
+            job.get('score', 0),
+            job.get('source', ''),
+            now,
+            now,
+            json.dumps(job, separators=(',', ':'))
+        ) for job in jobs]
+        
+        with self.transaction() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM jobs')
+            before = cursor.fetchone()[0]
+            
+            # Existing jobs only get last_seen, score and raw_data refreshed
+            cursor.executemany('''
+                INSERT INTO jobs (
+                    url, title, company, location, salary, score, source,
+                    first_seen, last_seen, raw_data
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    last_seen = excluded.last_seen,
+                    score = excluded.score,
+                    raw_data = excluded.raw_data
+            ''', rows)
+            
+            cursor.execute('SELECT COUNT(*) FROM jobs')
+            after = cursor.fetchone()[0]
+        
+        return after - before
+    
     def mark_jobs_sent(self, job_urls: List[str]):
         """Mark jobs as sent in email"""
         conn = self._get_conn()
@@ -66,15 +156,13 @@ class JobDatabase:
         
         now = datetime.utcnow().isoformat()
         
-        for url in job_urls:
-            cursor.execute('''
-                UPDATE jobs 
-                SET sent_in_email = 1, sent_date = ?
-                WHERE url = ?
-            ''', (now, url))
+        cursor.executemany('''
+            UPDATE jobs
+            SET sent_in_email = 1, sent_date = ?
+            WHERE url = ?
+        ''', [(now, url) for url in job_urls])
         
-        conn.commit()
-        conn.close()
+        self._commit(conn)
     
     def get_unsent_jobs(self, limit: Optional[int] = None) -> List[Dict]:
         """Get jobs that haven't been sent in email yet"""
@@ -82,38 +170,21 @@ class JobDatabase:
         cursor = conn.cursor()
         
         query = '''
-            SELECT url, title, company, location, salary, score, source, raw_data
+            SELECT url, title, company, location, salary, score, source
             FROM jobs
             WHERE sent_in_email = 0
             ORDER BY score DESC, first_seen DESC
         '''
+        params = ()
         
         if limit:
-            query += f' LIMIT {limit}'
-        
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        conn.close()
-        
-        jobs = []
-        for row in rows:
-            try:
-                # Try to parse raw_data first
-                job = json.loads(row[7])
-            except:
-                # Fallback to constructing from columns
-                job = {
-                    'url': row[0],
-                    'title': row[1],
-                    'company': row[2],
-                    'location': row[3],
-                    'salary': row[4],
-                    'score': row[5],
-                    'source': row[6]
-                }
-            jobs.append(job)
-        
-        return jobs
+            query += ' LIMIT ?'
+            params = (limit,)
+        
+        cursor.execute(query, params)
+        
+        # Built from columns; raw_data is not needed downstream
+        return [dict(row) for row in cursor]
     
     def log_email(self, recipient: str, job_count: int, subject: str, success: bool):
         """Log an email send"""
@@ -125,8 +196,7 @@ class JobDatabase:
             VALUES (?, ?, ?, ?, ?)
         ''', (datetime.utcnow().isoformat(), recipient, job_count, subject, success))
         
-        conn.commit()
-        conn.close()
+        self._commit(conn)
     
     def log_search_run(self, jobs_found: int, jobs_validated: int, jobs_new: int, 
                        duration: float, success: bool):
@@ -141,50 +211,109 @@ class JobDatabase:
         ''', (datetime.utcnow().isoformat(), jobs_found, jobs_validated, jobs_new,
               duration, success))
         
-        conn.commit()
-        conn.close()
+        self._commit(conn)
     
     def get_stats(self) -> Dict:
         """Get database statistics"""
         conn = self._get_conn()
         cursor = conn.cursor()
         
-        stats = {}
-        
-        # Total jobs
-        cursor.execute('SELECT COUNT(*) FROM jobs')
-        stats['total_jobs'] = cursor.fetchone()[0]
-        
-        # Sent jobs
-        cursor.execute('SELECT COUNT(*) FROM jobs WHERE sent_in_email = 1')
-        stats['sent_jobs'] = cursor.fetchone()[0]
-        
-        # Unsent jobs
-        cursor.execute('SELECT COUNT(*) FROM jobs WHERE sent_in_email = 0')
-        stats['unsent_jobs'] = cursor.fetchone()[0]
+        # Job counts in a single pass over jobs
+        cursor.execute('''
+            SELECT COUNT(*),
+                   COALESCE(SUM(sent_in_email = 1), 0),
+                   COALESCE(SUM(sent_in_email = 0), 0)
+            FROM jobs
+        ''')
+        total_jobs, sent_jobs, unsent_jobs = cursor.fetchone()
         
-        # Total emails
-        cursor.execute('SELECT COUNT(*) FROM email_log')
-        stats['total_emails'] = cursor.fetchone()[0]
+        stats = {
+            'total_jobs': total_jobs,
+            'sent_jobs': sent_jobs,
+            'unsent_jobs': unsent_jobs
+        }
         
-        # Last search run
+        # Total emails and last search run
         cursor.execute('''
-            SELECT run_date, jobs_found, jobs_new 
-            FROM search_runs 
-            ORDER BY run_date DESC 
-            LIMIT 1
+            SELECT (SELECT COUNT(*) FROM email_log), run_date, jobs_found, jobs_new
+            FROM (SELECT 1)
+            LEFT JOIN (
+                SELECT run_date, jobs_found, jobs_new
+                FROM search_runs
+                ORDER BY run_date DESC
+                LIMIT 1
+            )
         ''')
         row = cursor.fetchone()
-        if row:
+        stats['total_emails'] = row[0]
+        if row[1] is not None:
             stats['last_search'] = {
-                'date': row[0],
-                'found': row[1],
-                'new': row[2]
+                'date': row[1],
+                'found': row[2],
+                'new': row[3]
             }
         
-        conn.close()
         return stats
     
+    def get_cached_validation(self, url: str) -> Optional[Dict]:
+        """Get the last validation result and HTTP validators for a URL"""
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT etag, last_modified, result, checked_at
+            FROM validation_cache
+            WHERE url = ?
+        ''', (url,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        
+        return {
+            'etag': row['etag'],
+            'last_modified': row['last_modified'],
+            'result': json.loads(row['result']),
+            'checked_at': row['checked_at']
+        }
+    
+    def put_cached_validation(self, url: str, etag: Optional[str],
+                              last_modified: Optional[str], result: Dict):
+        """Store a validation result and the HTTP validators it was fetched with"""
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO validation_cache (url, etag, last_modified, result, checked_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                result = excluded.result,
+                checked_at = excluded.checked_at
+        ''', (url, etag, last_modified, json.dumps(result, separators=(',', ':')),
+              datetime.utcnow().isoformat()))
+        
+        self._commit(conn)
+    
+    def get_jobs_version(self) -> str:
+        """
+        Get a token that changes whenever the jobs table changes
+        (new or refreshed jobs, or jobs marked as sent)
+        Each MAX is a separate subquery so it is answered from the rowid
+        or an index instead of scanning jobs
+        """
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT (SELECT MAX(id) FROM jobs),
+                   (SELECT MAX(last_seen) FROM jobs),
+                   (SELECT MAX(sent_date) FROM jobs)
+        ''')
+        max_id, last_seen, sent_date = cursor.fetchone()
+        
+        return f'{max_id}:{last_seen}:{sent_date}'
+    
     def get_recent_jobs(self, limit: int = 50) -> List[Dict]:
         """Get recent jobs for dashboard"""
         conn = self._get_conn()
@@ -198,22 +327,15 @@ class JobDatabase:
             LIMIT ?
         ''', (limit,))
         
-        rows = cursor.fetchall()
-        conn.close()
-        
-        jobs = []
-        for row in rows:
-            jobs.append({
-                'url': row[0],
-                'title': row[1],
-                'company': row[2],
-                'location': row[3],
-                'salary': row[4],
-                'score': row[5],
-                'source': row[6],
-                'first_seen': row[7],
-                'sent': bool(row[8]),
-                'sent_date': row[9]
-            })
-        
-        return jobs
+        return [{
+            'url': row['url'],
+            'title': row['title'],
+            'company': row['company'],
+            'location': row['location'],
+            'salary': row['salary'],
+            'score': row['score'],
+            'source': row['source'],
+            'first_seen': row['first_seen'],
+            'sent': bool(row['sent_in_email']),
+            'sent_date': row['sent_date']
+        } for row in cursor]
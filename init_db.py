@@ -3,7 +3,6 @@
 Initialize the Nina job search database
 """
 import sqlite3
-from datetime import datetime
 
 DB_PATH = 'nina_jobs.db'
 
@@ -70,11 +69,48 @@ def init_database():
         )
     ''')
     
+    # Validation cache - last URL check result plus HTTP validators
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS validation_cache (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            result TEXT NOT NULL,
+            checked_at TEXT NOT NULL
+        )
+    ''')
+    
+    # Indexes for the dashboard and email queries
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_jobs_first_seen
+        ON jobs (first_seen DESC)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_jobs_unsent
+        ON jobs (score DESC, first_seen DESC)
+        WHERE sent_in_email = 0
+    ''')
+    # Let the /api/jobs version check read MAX(last_seen) / MAX(sent_date)
+    # from an index instead of scanning jobs
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_jobs_last_seen
+        ON jobs (last_seen)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_jobs_sent_date
+        ON jobs (sent_date)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_search_runs_date
+        ON search_runs (run_date DESC)
+    ''')
+    cursor.execute('ANALYZE')
+    
     conn.commit()
     conn.close()
     
     print(f"✅ Database initialized at {DB_PATH}")
-    print("Tables created: jobs, email_log, feedback, search_runs")
+    print("Tables created: jobs, email_log, feedback, search_runs, validation_cache")
 
 if __name__ == '__main__':
     init_database()
@@ -7,6 +7,49 @@ and compile results into raw_jobs.json
 import json
 import re
 from typing import List, Dict
+from urllib.parse import urlsplit
+
+# Company career sites, keyed by domain (subdomains match too)
+_HOST_COMPANY = {
+    'amazon.jobs': 'Amazon',
+    'careers.google.com': 'Google',
+    'jobs.apple.com': 'Apple',
+    'jobs.netflix.com': 'Netflix',
+    'disneycareers.com': 'Disney'
+}
+
+def _host_matches(host: str, domain: str) -> bool:
+    """True if host is domain or one of its subdomains"""
+    return host == domain or host.endswith('.' + domain)
+
+def _host_company(host: str) -> str:
+    """
+    Look up the company for a career-site host or any parent domain
+    (a.b.c checks a.b.c, then b.c, then c)
+    """
+    labels = host.split('.')
+    for i in range(len(labels)):
+        company = _HOST_COMPANY.get('.'.join(labels[i:]))
+        if company:
+            return company
+    return ''
+
+# Patterns used for every search result, compiled once
+_GREENHOUSE_RE = re.compile(r'https?://([^.]+)\.greenhouse\.io')
+_LEVER_RE = re.compile(r'https?://jobs\.lever\.co/([^/]+)')
+_WORKABLE_RE = re.compile(r'https?://apply\.workable\.com/([^/]+)')
+# Location patterns, tried in order - specific neighbourhoods before plain LA
+_LOCATION_PATTERNS = (
+    re.compile(
+        r'(Santa Monica|Venice|Culver City|Playa Vista|Marina del Rey|El Segundo|Manhattan Beach|Hermosa Beach|Redondo Beach|West Los Angeles|Los Angeles),?\s*CA',
+        re.IGNORECASE
+    ),
+    re.compile(r'(Los Angeles|LA),?\s*CA', re.IGNORECASE)
+)
+_JOB_INDICATOR_RE = re.compile(
+    r'jobs|careers|job|position|apply|greenhouse\.io|lever\.co|workable\.com|linkedin\.com/jobs|indeed\.com|glassdoor\.com',
+    re.IGNORECASE
+)
 
 def extract_job_from_search_result(result: Dict, query: str) -> Dict:
     """
@@ -20,36 +63,35 @@ def extract_job_from_search_result(result: Dict, query: str) -> Dict:
     # Try to extract company from URL or title
     company = ''
     
-    # Common job board patterns
-    if 'greenhouse.io' in url:
+    # Common job board patterns, dispatched on the URL host (port stripped)
+    try:
+        host = urlsplit(url).hostname or ''
+    except ValueError:
+        # Malformed URL (e.g. a bad IPv6 literal) - fall back to the title
+        host = ''
+    
+    if host.endswith('.greenhouse.io'):
         # Extract company from greenhouse URL: company-name.greenhouse.io
-        match = re.search(r'https?://([^.]+)\.greenhouse\.io', url)
+        match = _GREENHOUSE_RE.search(url)
         if match:
             company = match.group(1).replace('-', ' ').title()
-    elif 'lever.co' in url:
-        match = re.search(r'https?://jobs\.lever\.co/([^/]+)', url)
+    elif host.endswith('.lever.co'):
+        match = _LEVER_RE.search(url)
         if match:
             company = match.group(1).replace('-', ' ').title()
-    elif 'workable.com' in url:
-        match = re.search(r'https?://apply\.workable\.com/([^/]+)', url)
+    elif host.endswith('.workable.com'):
+        match = _WORKABLE_RE.search(url)
         if match:
             company = match.group(1).replace('-', ' ').title()
-    elif 'linkedin.com/jobs' in url:
+    elif _host_matches(host, 'linkedin.com') and 'linkedin.com/jobs' in url:
         # Try to extract from title (usually "Title - Company")
         if ' - ' in title:
             parts = title.split(' - ')
             if len(parts) >= 2:
                 company = parts[1].strip()
-    elif 'amazon.jobs' in url:
-        company = 'Amazon'
-    elif 'careers.google.com' in url:
-        company = 'Google'
-    elif 'jobs.apple.com' in url:
-        company = 'Apple'
-    elif 'jobs.netflix.com' in url:
-        company = 'Netflix'
-    elif 'disneycareers.com' in url:
-        company = 'Disney'
+    else:
+        # Career sites match on the domain or any subdomain of it
+        company = _host_company(host)
     
     # If still no company, try to extract from title
     if not company and ' at ' in title:
@@ -63,12 +105,9 @@ def extract_job_from_search_result(result: Dict, query: str) -> Dict:
     
     # Extract location from snippet or title
     location = ''
-    location_patterns = [
-        r'(Santa Monica|Venice|Culver City|Playa Vista|Marina del Rey|El Segundo|Manhattan Beach|Hermosa Beach|Redondo Beach|West Los Angeles|Los Angeles),?\s*CA',
-        r'(Los Angeles|LA),?\s*CA'
-    ]
-    for pattern in location_patterns:
-        match = re.search(pattern, snippet + ' ' + title, re.IGNORECASE)
+    text = snippet + ' ' + title
+    for pattern in _LOCATION_PATTERNS:
+        match = pattern.search(text)
         if match:
             location = match.group(0)
             break
@@ -101,16 +140,10 @@ def compile_search_results(search_results: List[Dict]) -> List[Dict]:
     for result in search_results:
         # Only include results that look like job postings
         url = result.get('url', '')
-        title = result.get('title', '').lower()
+        title = result.get('title', '')
         
         # Filter out non-job URLs
-        job_indicators = [
-            'jobs', 'careers', 'job', 'position', 'apply',
-            'greenhouse.io', 'lever.co', 'workable.com',
-            'linkedin.com/jobs', 'indeed.com', 'glassdoor.com'
-        ]
-        
-        if not any(indicator in url.lower() or indicator in title for indicator in job_indicators):
+        if not (_JOB_INDICATOR_RE.search(url) or _JOB_INDICATOR_RE.search(title)):
             continue
         
         # Extract job info
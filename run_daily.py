@@ -12,7 +12,7 @@ import sys
 import time
 from datetime import datetime
 from db import JobDatabase
-from search_jobs import generate_search_queries, score_job
+from search_jobs import generate_search_queries, score_jobs
 from validate_jobs import validate_jobs
 from send_email import send_job_email
 
@@ -58,38 +58,31 @@ def run_daily_search():
     
     # Step 2: Score jobs
     print("STEP 2: Scoring jobs...")
-    for job in raw_jobs:
-        job['score'] = score_job(job)
-    
-    # Sort by score
-    raw_jobs.sort(key=lambda x: x.get('score', 0), reverse=True)
+    score_jobs(raw_jobs)
     print(f"✅ Scored {len(raw_jobs)} jobs\n")
     
     # Step 3: Validate jobs
     print("STEP 3: Validating jobs (checking for active Apply buttons)...")
-    valid_jobs = validate_jobs(raw_jobs, delay=1.0)
+    valid_jobs = validate_jobs(raw_jobs, delay=1.0, cache=db)
     print(f"✅ {len(valid_jobs)}/{len(raw_jobs)} jobs validated\n")
     
-    # Step 4: Add to database
+    # Step 4: Add to database, logged with the search run in one transaction
     print("STEP 4: Adding jobs to database...")
-    new_count = 0
-    for job in valid_jobs:
-        is_new = db.add_job(job)
-        if is_new:
-            new_count += 1
+    with db.transaction():
+        new_count = db.add_jobs_batch(valid_jobs)
+        
+        # Log search run
+        duration = time.time() - start_time
+        db.log_search_run(
+            jobs_found=len(raw_jobs),
+            jobs_validated=len(valid_jobs),
+            jobs_new=new_count,
+            duration=duration,
+            success=True
+        )
     
     print(f"✅ Added {new_count} new jobs to database ({len(valid_jobs) - new_count} already existed)\n")
     
-    # Log search run
-    duration = time.time() - start_time
-    db.log_search_run(
-        jobs_found=len(raw_jobs),
-        jobs_validated=len(valid_jobs),
-        jobs_new=new_count,
-        duration=duration,
-        success=True
-    )
-    
     # Step 5: Send email if new jobs found
     if new_count > 0:
         print("STEP 5: Sending email...")
@@ -3,66 +3,98 @@
 Search for jobs matching Nina's criteria
 """
 import json
-import os
-import sys
-import time
-from typing import List, Dict
+import re
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Dict, Tuple
 
-# Add OpenClaw modules to path
-sys.path.insert(0, '/home/ck/.npm-global/lib/node_modules/openclaw/dist/cjs')
+from config_cache import CONFIG, CFG
 
-from db import JobDatabase
+MAX_QUERIES = 20  # Limit queries per run to avoid rate limits
 
-# Load config
-with open('config.json', 'r') as f:
-    CONFIG = json.load(f)
+# Major job boards, in priority order
+JOB_BOARDS = (
+    'linkedin.com/jobs',
+    'greenhouse.io',
+    'lever.co',
+    'workable.com',
+    'indeed.com',
+    'glassdoor.com'
+)
+
+CREATIVE_KEYWORDS = ['creative', 'design', 'studio', 'art', 'film', 'tv', 'entertainment']
+
+def _keyword_pattern(keywords: Iterable[str]) -> re.Pattern:
+    """
+    Compile lowercase keywords into one alternation, scanned in a single pass
+    An empty list compiles to a pattern that never matches
+    """
+    keywords = [kw for kw in keywords if kw]
+    if not keywords:
+        return re.compile(r'(?!)')
+    return re.compile('|'.join(re.escape(kw) for kw in keywords))
+
+# Keyword matchers, built once from config
+_LOCATION_RE = _keyword_pattern(CFG.locations)
+_TITLE_RE = _keyword_pattern(CFG.job_titles)
+_COMPANY_RE = _keyword_pattern(CFG.target_companies)
+_INDUSTRY_RE = _keyword_pattern(CFG.industries)
+_CREATIVE_RE = _keyword_pattern(CREATIVE_KEYWORDS)
+_EXCLUDE_RE = _keyword_pattern(CFG.exclude_keywords)
+
+# Scoring weights, bound as module globals for the per-job hot path
+_S_LOCATION = CFG.scoring_location
+_S_TITLE = CFG.scoring_title
+_S_COMPANY = CFG.scoring_company
+_S_INDUSTRY = CFG.scoring_industry
+_S_CREATIVE = CFG.scoring_creative
 
 def score_job(job: Dict) -> int:
     """Score a job based on Nina's criteria"""
     score = 0
-    scoring = CONFIG['scoring']
-    search = CONFIG['search']
     
     title_lower = job.get('title', '').lower()
     company_lower = job.get('company', '').lower()
     location_lower = job.get('location', '').lower()
+    combined_text = title_lower + ' ' + company_lower
+    
+    # Excluded jobs are rejected outright, skipping the other checks
+    if _EXCLUDE_RE.search(combined_text):
+        return 0
     
     # Location match
-    for loc in search['locations']:
-        if loc.lower() in location_lower:
-            score += scoring['location_match']
-            break
+    if _LOCATION_RE.search(location_lower):
+        score += _S_LOCATION
     
     # Title match
-    for title in search['job_titles']:
-        if title.lower() in title_lower:
-            score += scoring['title_match']
-            break
+    if _TITLE_RE.search(title_lower):
+        score += _S_TITLE
     
     # Company match
-    for company in search['target_companies']:
-        if company.lower() in company_lower:
-            score += scoring['company_match']
-            break
+    if _COMPANY_RE.search(company_lower):
+        score += _S_COMPANY
     
     # Industry match (in title or company)
-    combined_text = (title_lower + ' ' + company_lower).lower()
-    for industry in search['industries_priority']:
-        if industry.lower() in combined_text:
-            score += scoring['industry_match']
-            break
+    if _INDUSTRY_RE.search(combined_text):
+        score += _S_INDUSTRY
     
     # Creative industry bonus
-    creative_keywords = ['creative', 'design', 'studio', 'art', 'film', 'tv', 'entertainment']
-    if any(kw in combined_text for kw in creative_keywords):
-        score += scoring['creative_industry']
+    if _CREATIVE_RE.search(combined_text):
+        score += _S_CREATIVE
     
-    # Exclude keywords (negative scoring)
-    for exclude in search['exclude_keywords']:
-        if exclude.lower() in combined_text:
-            score -= 10  # Heavy penalty
+    return score
+
+def score_jobs(jobs: List[Dict]) -> List[Dict]:
+    """
+    Score a batch of jobs in place
+    Returns the same list sorted by score, best first
+    """
+    for job in jobs:
+        job['score'] = score_job(job)
     
-    return max(0, score)  # Don't go below 0
+    jobs.sort(key=itemgetter('score'), reverse=True)
+    return jobs
 
 def search_jobs_web(query: str, location: str = "", count: int = 10) -> List[Dict]:
     """
@@ -76,63 +108,68 @@ def search_jobs_web(query: str, location: str = "", count: int = 10) -> List[Dic
     # For now, return empty (OpenClaw will populate via web_search tool)
     return []
 
-def search_company_pages(companies: List[str], job_titles: List[str]) -> List[str]:
+def search_company_pages(companies: List[str], job_titles: List[str]) -> Iterator[str]:
     """
     Generate search queries for company career pages
-    Returns list of search queries to be executed
+    Yields search queries to be executed
     """
-    queries = []
-    
     for company in companies:
+        slug = company.lower().replace(" ", "")
         for title in job_titles[:3]:  # Limit to top 3 titles per company
-            query = f'site:careers.{company.lower().replace(" ", "")}.com OR site:jobs.{company.lower().replace(" ", "")}.com "{title}"'
-            queries.append(query)
-    
-    return queries
+            yield f'site:careers.{slug}.com OR site:jobs.{slug}.com "{title}"'
 
-def search_job_boards(job_titles: List[str], locations: List[str]) -> List[str]:
+def search_job_boards(job_titles: List[str], locations: List[str]) -> Iterator[str]:
     """
     Generate search queries for major job boards
-    Returns list of search queries
+    Yields search queries
     """
-    queries = []
-    boards = [
-        'linkedin.com/jobs',
-        'greenhouse.io',
-        'lever.co',
-        'workable.com',
-        'indeed.com',
-        'glassdoor.com'
-    ]
-    
     for title in job_titles[:5]:  # Top 5 titles
         for loc in locations[:3]:  # Top 3 locations
-            for board in boards[:3]:  # Top 3 boards
-                query = f'site:{board} "{title}" "{loc}"'
-                queries.append(query)
-    
-    return queries
+            for board in JOB_BOARDS[:3]:  # Top 3 boards
+                yield f'site:{board} "{title}" "{loc}"'
 
-def generate_search_queries() -> List[str]:
-    """Generate all search queries for this run"""
+def search_industries(industries: List[str], job_titles: List[str],
+                      locations: List[str]) -> Iterator[str]:
+    """
+    Generate industry-specific search queries
+    Yields search queries
+    """
+    for industry in industries[:5]:
+        for title in job_titles[:3]:
+            for loc in locations[:2]:
+                yield f'"{title}" "{industry}" "{loc}" jobs'
+
+@lru_cache(maxsize=1)
+def _build_search_queries() -> Tuple[str, ...]:
+    """Build the search queries from config (cached, config is fixed per process)"""
     search = CONFIG['search']
     
+    all_queries = chain(
+        # Company-specific searches
+        search_company_pages(search['target_companies'], search['job_titles']),
+        # Job board searches
+        search_job_boards(search['job_titles'], search['locations']),
+        # Industry-specific searches
+        search_industries(search['industries_priority'], search['job_titles'],
+                          search['locations'])
+    )
+    
+    # Keep the first distinct queries; later ones are never generated
     queries = []
+    seen = set()
+    for query in all_queries:
+        if query in seen:
+            continue
+        seen.add(query)
+        queries.append(query)
+        if len(queries) >= MAX_QUERIES:
+            break
     
-    # Company-specific searches
-    queries.extend(search_company_pages(search['target_companies'], search['job_titles']))
-    
-    # Job board searches
-    queries.extend(search_job_boards(search['job_titles'], search['locations']))
-    
-    # Industry-specific searches
-    for industry in search['industries_priority'][:5]:
-        for title in search['job_titles'][:3]:
-            for loc in search['locations'][:2]:
-                query = f'"{title}" "{industry}" "{loc}" jobs'
-                queries.append(query)
-    
-    return queries[:20]  # Limit to 20 queries to avoid rate limits
+    return tuple(queries)
+
+def generate_search_queries() -> List[str]:
+    """Generate all search queries for this run"""
+    return list(_build_search_queries())
 
 if __name__ == '__main__':
     # When run standalone, just generate queries
@@ -2,117 +2,115 @@
 """
 Send job search results via AgentMail
 """
+import os
 import sys
-import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-sys.path.insert(0, '/home/ck/.openclaw/workspace')
-from agentmail import AgentMail
+from functools import lru_cache
+from jinja2 import Environment, FileSystemLoader, select_autoescape
 from db import JobDatabase
+from config_cache import CONFIG
 
-# Load config
-with open('config.json', 'r') as f:
-    CONFIG = json.load(f)
+# Score tiers: (min score, emoji, color, label), best first
+SCORE_TIERS = (
+    (15, '🌟', '#4CAF50', 'High Match'),
+    (10, '⭐', '#FF9800', 'Good Match'),
+    (0, '✨', '#2196F3', 'Potential Match')
+)
 
-def format_job_email(jobs, count=10):
-    """Format jobs as HTML email"""
+def tier(score):
+    """Return the (min score, emoji, color, label) tier for a score"""
+    for row in SCORE_TIERS:
+        if score >= row[0]:
+            return row
+    return SCORE_TIERS[-1]
+
+# Email templates, loaded and compiled once
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+TEMPLATE_ENV = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=select_autoescape(['html']),
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True
+)
+TEMPLATE_ENV.filters['tier'] = tier
+HTML_TEMPLATE = TEMPLATE_ENV.get_template('job_email.html')
+
+AGENTMAIL_PATH = '/home/ck/.openclaw/workspace'
+API_KEY_FILE = os.path.join(AGENTMAIL_PATH, 'agentmail_api_key')
+
+# Each send is a blocking HTTPS call, so recipients are sent to in parallel
+MAX_SEND_WORKERS = 8
+
+@lru_cache(maxsize=None)
+def _client(api_key_file=API_KEY_FILE):
+    """Read the API key and build the AgentMail client once per key file"""
+    # Imported on first send so runs that send nothing skip the SDK import
+    if AGENTMAIL_PATH not in sys.path:
+        sys.path.insert(0, AGENTMAIL_PATH)
+    from agentmail import AgentMail
+    
+    with open(api_key_file, 'r') as f:
+        api_key = f.read().strip()
+    return AgentMail(api_key=api_key)
+
+@lru_cache(maxsize=1)
+def _get_db():
+    """Shared JobDatabase for this process"""
+    return JobDatabase()
+
+def format_job_email(jobs, count=10, text_body=True):
+    """
+    Format jobs as HTML email, plus a plain-text version
+    With text_body=False the plain text is skipped and returned as ''
+    """
     if not jobs:
         return None, None
     
     top_jobs = jobs[:count]
     
-    # Plain text version
-    text = f"Nina Job Search - {len(top_jobs)} Top Matches\n\n"
-    for i, job in enumerate(top_jobs, 1):
-        emoji = "🌟" if job['score'] >= 15 else "⭐" if job['score'] >= 10 else "✨"
-        score_label = "High Match" if job['score'] >= 15 else "Good Match" if job['score'] >= 10 else "Potential Match"
-        
-        text += f"{emoji} {i}. {job['title']}\n"
-        text += f"Score: {job['score']}/20 ({score_label})\n"
-        text += f"Company: {job['company']}\n"
-        text += f"Location: {job['location']}\n"
-        if job.get('salary'):
-            text += f"Salary: {job['salary']}\n"
-        if job.get('source'):
-            text += f"Source: {job['source']}\n"
-        text += f"Link: {job['url']}\n\n"
-    
-    text += f"\nFound {len(jobs)} new jobs this round.\n"
-    text += "Next search 7am tomorrow."
-    
     # HTML version
-    html = f"""
-    <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-        <h2 style="color: #4A90E2;">🔎 Nina Job Search - {len(top_jobs)} Top Matches</h2>
-        <p>Here are the latest job matches based on your criteria:</p>
-    """
+    html = HTML_TEMPLATE.render(top_jobs=top_jobs, total=len(jobs))
     
+    if not text_body:
+        return '', html
+    
+    # Plain text version, built as parts and joined once
+    parts = [f"Nina Job Search - {len(top_jobs)} Top Matches\n\n"]
     for i, job in enumerate(top_jobs, 1):
-        emoji = "🌟" if job['score'] >= 15 else "⭐" if job['score'] >= 10 else "✨"
-        
-        # Color-code the score
-        if job['score'] >= 15:
-            score_color = "#4CAF50"  # Green
-            score_label = "High Match"
-        elif job['score'] >= 10:
-            score_color = "#FF9800"  # Orange
-            score_label = "Good Match"
-        else:
-            score_color = "#2196F3"  # Blue
-            score_label = "Potential Match"
+        _, emoji, _, score_label = tier(job['score'])
         
-        html += f"""
-        <div style="border-left: 3px solid #4A90E2; padding-left: 15px; margin: 20px 0;">
-            <h3 style="margin: 5px 0;">{emoji} {i}. {job['title']}</h3>
-            <p style="margin: 10px 0 15px 0;">
-                <span style="background-color: {score_color}; color: white; padding: 6px 12px; border-radius: 4px; font-weight: bold; font-size: 14px;">
-                    Score: {job['score']}/20 — {score_label}
-                </span>
-            </p>
-            <p style="margin: 5px 0;"><strong>🏢 Company:</strong> {job['company']}</p>
-            <p style="margin: 5px 0;"><strong>📍 Location:</strong> {job['location']}</p>
-        """
+        parts.append(f"{emoji} {i}. {job['title']}\n")
+        parts.append(f"Score: {job['score']}/20 ({score_label})\n")
+        parts.append(f"Company: {job['company']}\n")
+        parts.append(f"Location: {job['location']}\n")
         if job.get('salary'):
-            html += f"<p style='margin: 5px 0;'><strong>💰 Salary:</strong> {job['salary']}</p>"
+            parts.append(f"Salary: {job['salary']}\n")
         if job.get('source'):
-            html += f"<p style='margin: 5px 0; color: #666; font-size: 13px;'><strong>📌 Source:</strong> {job['source']}</p>"
-        
-        html += f"""
-            <p style="margin: 5px 0;"><a href="{job['url']}" style="color: #4A90E2; text-decoration: none;">🔗 View Details →</a></p>
-        </div>
-        """
-    
-    html += f"""
-        <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
-        <p style="color: #888; font-size: 12px;">
-            Found {len(jobs)} new jobs this round.<br>
-            Next search 7am tomorrow.
-        </p>
-        <p style="color: #888; font-size: 12px;">
-            — ET Scout 👽<br>
-            Automated Job Hunter
-        </p>
-    </div>
-    """
+            parts.append(f"Source: {job['source']}\n")
+        parts.append(f"Link: {job['url']}\n\n")
+    
+    parts.append(f"\nFound {len(jobs)} new jobs this round.\n")
+    parts.append("Next search 7am tomorrow.")
+    text = ''.join(parts)
     
     return text, html
 
-def send_job_email(jobs, api_key_file='/home/ck/.openclaw/workspace/agentmail_api_key'):
+def send_job_email(jobs, api_key_file=API_KEY_FILE):
     """Send job results via AgentMail"""
     
     config = CONFIG['email']
     
-    # Read API key
-    with open(api_key_file, 'r') as f:
-        api_key = f.read().strip()
-    
-    # Initialize client
-    client = AgentMail(api_key=api_key)
-    db = JobDatabase()
+    # Client and database are built once and reused across sends
+    client = _client(api_key_file)
+    db = _get_db()
     
     # Format email
-    text, html = format_job_email(jobs, count=config['top_count'])
+    text, html = format_job_email(jobs, count=config['top_count'],
+                                  text_body=config.get('text_body', True))
     
-    if not text:
+    if not html:
         print("No jobs to send")
         return False
     
@@ -120,8 +118,13 @@ def send_job_email(jobs, api_key_file='/home/ck/.openclaw/workspace/agentmail_ap
     date_str = datetime.now().strftime("%b %d")
     subject = f"🔎 Nina Job Search - {date_str} - Top {min(len(jobs), config['top_count'])} Matches"
     
-    success = True
-    for recipient in config['recipients']:
+    # Only attach a text part if one was built
+    body = {'html': html}
+    if text:
+        body['text'] = text
+    
+    def send_one(recipient):
+        """Send to one recipient; returns (recipient, sent)"""
         try:
             print(f"Sending to {recipient}... (BCC: {config['bcc']})")
             client.inboxes.messages.send(
@@ -129,29 +132,38 @@ def send_job_email(jobs, api_key_file='/home/ck/.openclaw/workspace/agentmail_ap
                 to=recipient,
                 bcc=config['bcc'],
                 subject=subject,
-                text=text,
-                html=html
+                **body
             )
             print(f"✅ Sent to {recipient}")
-            
-            # Log email
-            db.log_email(recipient, len(jobs), subject, True)
+            return recipient, True
             
         except Exception as e:
             print(f"❌ Failed to send to {recipient}: {e}")
-            db.log_email(recipient, len(jobs), subject, False)
-            success = False
+            return recipient, False
+    
+    recipients = config['recipients']
+    workers = max(1, min(MAX_SEND_WORKERS, len(recipients)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        outcomes = list(executor.map(send_one, recipients))
+    
+    success = all(sent for _, sent in outcomes)
+    
+    # Log sends and mark jobs as sent in one transaction
+    with db.transaction():
+        for recipient, sent in outcomes:
+            db.log_email(recipient, len(jobs), subject, sent)
+        
+        if success:
+            job_urls = [job['url'] for job in jobs]
+            db.mark_jobs_sent(job_urls)
     
     if success:
-        # Mark jobs as sent
-        job_urls = [job['url'] for job in jobs]
-        db.mark_jobs_sent(job_urls)
         print(f"\n✅ Marked {len(job_urls)} jobs as sent")
     
     return success
 
 if __name__ == '__main__':
-    db = JobDatabase()
+    db = _get_db()
     
     # Get unsent jobs from database
     jobs = db.get_unsent_jobs(limit=CONFIG['email']['top_count'])
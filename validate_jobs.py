@@ -2,14 +2,150 @@
 """
 Validate job URLs - check if they're still active and have Apply buttons
 """
+import re
+import sqlite3
 import requests
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml.etree import strip_elements
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
-from typing import Dict, List
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+from db import JobDatabase
 
-def validate_job_url(url: str, timeout: int = 10) -> Dict:
+# Validation is network-bound, so a handful of threads overlap the waits
+MAX_WORKERS = 8
+
+# Pages are read in chunks; the first STREAM_HEAD_CHUNKS (64 KB) are scanned first
+STREAM_CHUNK_SIZE = 8192
+STREAM_HEAD_CHUNKS = 8
+
+# A cached pass younger than this is trusted without re-fetching
+CACHE_MAX_AGE = timedelta(hours=1)
+
+# Shared session so repeat hits to the same ATS host reuse the TCP/TLS connection
+SESSION = requests.Session()
+SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+})
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+)
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+
+# Phrases that mean the posting is closed
+CLOSED_INDICATORS = (
+    'no longer accepting',
+    'position closed',
+    'position filled',
+    'applications closed',
+    'job is closed',
+    'expired',
+    'this job is no longer available',
+    'job not found',
+    'may have been taken down',
+    'no longer available',
+    'has been removed',
+    'posting has closed',
+    'not accepting applications',
+    'this job has expired',
+    'not actively hiring'
+)
+
+# Phrases that mark an Apply button
+APPLY_INDICATORS = (
+    'apply now',
+    'apply for',
+    'submit application',
+    'apply button',
+    'apply online',
+    'click to apply'
+)
+
+# One alternation per category, so each text is scanned once
+_CLOSED_RE = re.compile('|'.join(map(re.escape, CLOSED_INDICATORS)))
+_APPLY_RE = re.compile('|'.join(map(re.escape, APPLY_INDICATORS)))
+
+# Every Apply indicator contains this, so text without it can't match
+_APPLY_HINT = 'appl'
+
+def _scan_page(content: bytes, result: Dict) -> bool:
+    """
+    Check page HTML for closed / Apply indicators and record them in result
+    Returns True if either kind of indicator was found
+    """
+    # Parse HTML; only the body matters, minus script and style text
+    tree = lxml.html.fromstring(content)
+    body = tree.find('body')
+    if body is None:
+        body = tree
+    strip_elements(body, 'script', 'style', with_tail=False)
+    page_text = body.text_content().lower()
+    
+    # Check for "closed" indicators
+    if _CLOSED_RE.search(page_text):
+        result['is_closed'] = True
+        result['valid'] = False
+        result['error'] = 'Job posting appears closed'
+        return True
+    
+    # Element text is part of the (decoded) body text, so if neither it nor
+    # any candidate's class/id contains "appl", skip the per-element text walk
+    if _APPLY_HINT not in page_text and not any(
+            _APPLY_HINT in '\n'.join((element.get('class', ''),
+                                      element.get('id', ''))).lower()
+            for element in body.iter('button', 'a', 'input')):
+        result['error'] = 'No Apply button found'
+        return False
+    
+    # Check for Apply button - text, class and id of each candidate element
+    for element in body.iter('button', 'a', 'input'):
+        element_text = '\n'.join((
+            element.text_content(),
+            element.get('class', ''),
+            element.get('id', '')
+        )).lower()
+        
+        if _APPLY_RE.search(element_text):
+            result['has_apply_button'] = True
+            result['valid'] = True
+            result['error'] = None
+            return True
+    
+    result['error'] = 'No Apply button found'
+    return False
+
+def _cache_get(cache: JobDatabase, url: str) -> Optional[Dict]:
+    """Look up the validation cache; a DB error just means no cached row"""
+    try:
+        return cache.get_cached_validation(url)
+    except sqlite3.Error as e:
+        print(f"  ⚠️  Validation cache read failed: {e}")
+        return None
+
+def _cache_put(cache: JobDatabase, url: str, etag: Optional[str],
+               last_modified: Optional[str], result: Dict):
+    """Store in the validation cache; a DB error leaves the result uncached"""
+    try:
+        cache.put_cached_validation(url, etag, last_modified, result)
+    except sqlite3.Error as e:
+        print(f"  ⚠️  Validation cache write failed: {e}")
+
+def validate_job_url(url: str, timeout: int = 10,
+                     cache: Optional[JobDatabase] = None) -> Dict:
     """
     Validate a job URL
+    With a cache, a pass younger than CACHE_MAX_AGE is returned as is;
+    otherwise sends a conditional request and reuses the last outcome
+    when the page is unchanged (HTTP 304)
     Returns: {
         'valid': bool,
         'status_code': int,
@@ -18,6 +154,15 @@ def validate_job_url(url: str, timeout: int = 10) -> Dict:
         'error': str or None
     }
     """
+    cached = _cache_get(cache, url) if cache is not None else None
+    recent = _recent_pass(cached)
+    if recent:
+        return recent
+    return _validate(url, timeout, cache, cached)
+
+def _validate(url: str, timeout: int, cache: Optional[JobDatabase],
+              cached: Optional[Dict]) -> Dict:
+    """validate_job_url with the cache row already looked up"""
     result = {
         'valid': False,
         'status_code': None,
@@ -27,78 +172,41 @@ def validate_job_url(url: str, timeout: int = 10) -> Dict:
     }
     
     try:
-        # Fetch the page
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=timeout, allow_redirects=True)
-        result['status_code'] = response.status_code
-        
-        if response.status_code != 200:
-            result['error'] = f'HTTP {response.status_code}'
-            return result
-        
-        # Parse HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
-        page_text = soup.get_text().lower()
-        
-        # Check for "closed" indicators
-        closed_indicators = [
-            'no longer accepting',
-            'position closed',
-            'position filled',
-            'applications closed',
-            'job is closed',
-            'expired',
-            'this job is no longer available',
-            'job not found',
-            'may have been taken down',
-            'no longer available',
-            'has been removed',
-            'posting has closed',
-            'not accepting applications',
-            'this job has expired',
-            'not actively hiring'
-        ]
-        
-        for indicator in closed_indicators:
-            if indicator in page_text:
-                result['is_closed'] = True
-                result['error'] = 'Job posting appears closed'
-                return result
-        
-        # Check for Apply button
-        apply_indicators = [
-            'apply now',
-            'apply for',
-            'submit application',
-            'apply button',
-            'apply online',
-            'click to apply'
-        ]
+        # Fetch the page, conditionally if we have validators from a previous check
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
         
-        # Check both text and button elements
-        buttons = soup.find_all(['button', 'a', 'input'])
-        for button in buttons:
-            button_text = button.get_text().lower()
-            button_class = ' '.join(button.get('class', [])).lower()
-            button_id = (button.get('id') or '').lower()
+        with SESSION.get(url, headers=headers, timeout=timeout,
+                         allow_redirects=True, stream=True) as response:
+            result['status_code'] = response.status_code
             
-            for indicator in apply_indicators:
-                if (indicator in button_text or 
-                    indicator in button_class or 
-                    indicator in button_id):
-                    result['has_apply_button'] = True
-                    break
+            # Unchanged since the last check - reuse its outcome
+            if response.status_code == 304 and cached:
+                _cache_put(cache, url, cached['etag'], cached['last_modified'],
+                           cached['result'])
+                return cached['result']
             
-            if result['has_apply_button']:
-                break
+            if response.status_code != 200:
+                result['error'] = f'HTTP {response.status_code}'
+                return result
+            
+            # Markers almost always appear early, so scan the head of the page
+            # first and only download the rest if it was inconclusive
+            chunks = response.iter_content(STREAM_CHUNK_SIZE)
+            content = b''.join(islice(chunks, STREAM_HEAD_CHUNKS))
+            if not _scan_page(content, result):
+                # Rescan only if the page actually continued past the head
+                rest = b''.join(chunks)
+                if rest:
+                    _scan_page(content + rest, result)
         
-        # If we got here, the job appears valid
-        if result['has_apply_button'] and not result['is_closed']:
-            result['valid'] = True
-        elif not result['has_apply_button']:
-            result['error'] = 'No Apply button found'
+        if cache is not None:
+            _cache_put(cache, url, response.headers.get('ETag'),
+                       response.headers.get('Last-Modified'), result)
         
         return result
         
@@ -112,28 +220,76 @@ def validate_job_url(url: str, timeout: int = 10) -> Dict:
         result['error'] = f'Unexpected error: {str(e)[:50]}'
         return result
 
-def validate_jobs(jobs: List[Dict], delay: float = 1.0) -> List[Dict]:
+def _recent_pass(cached: Optional[Dict]) -> Optional[Dict]:
+    """Return the cached result if it passed within CACHE_MAX_AGE"""
+    if cached and cached['result']['valid']:
+        age = datetime.utcnow() - datetime.fromisoformat(cached['checked_at'])
+        if age < CACHE_MAX_AGE:
+            return cached['result']
+    return None
+
+def _host_of(url: str) -> str:
+    """Host to group a job URL under; '' if the URL can't be parsed"""
+    try:
+        return urlsplit(url).netloc
+    except (ValueError, TypeError, AttributeError):
+        # Malformed (e.g. a bad IPv6 literal) or not a string at all
+        return ''
+
+def validate_jobs(jobs: List[Dict], delay: float = 1.0,
+                  concurrency: int = MAX_WORKERS,
+                  cache: Optional[JobDatabase] = None) -> List[Dict]:
     """
-    Validate a list of jobs
-    Returns only valid jobs
+    Validate a list of jobs concurrently, at most `concurrency` hosts at a time
+    Requests to the same host are serialized and spaced by `delay`
+    With a cache, recent passes skip the network entirely
+    Returns only valid jobs, in their original order
     """
+    # Group by host: each host's jobs run in order on one worker (polite,
+    # keeps its pooled connection warm), different hosts run in parallel
+    by_host = defaultdict(list)
+    for i, job in enumerate(jobs):
+        # Unparseable URLs share the '' host; fetching them reports the error
+        by_host[_host_of(job['url'])].append(i)
+    
+    results = [None] * len(jobs)
+    
+    def check_host(indexes: List[int]):
+        last_request = None
+        for i in indexes:
+            url = jobs[i]['url']
+            cached = _cache_get(cache, url) if cache is not None else None
+            recent = _recent_pass(cached)
+            if recent:
+                results[i] = recent
+                continue
+            
+            # Rate limiting (per host) - only wait if this host was hit recently
+            if last_request is not None:
+                wait = last_request + delay - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+            try:
+                results[i] = _validate(url, 10, cache, cached)
+            finally:
+                last_request = time.monotonic()
+    
+    workers = max(1, min(concurrency, len(by_host)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # list() re-raises any worker exception here
+        list(executor.map(check_host, by_host.values()))
+    
     valid_jobs = []
     
-    for i, job in enumerate(jobs, 1):
+    for i, (job, result) in enumerate(zip(jobs, results), 1):
         print(f"\n[{i}/{len(jobs)}] Validating: {job['title']}")
         print(f"  URL: {job['url']}")
         
-        result = validate_job_url(job['url'])
-        
         if result['valid']:
             print(f"  ✅ VALID")
             valid_jobs.append(job)
         else:
             print(f"  ❌ INVALID: {result['error']}")
-        
-        # Rate limiting
-        if i < len(jobs):
-            time.sleep(delay)
     
     return valid_jobs
 